@@ -5,21 +5,237 @@ A Flask-based web application that generates personalized travel itineraries usi
 """
 
 import os
+import re
 import json
+import atexit
+import functools
+import hashlib
+import logging
+import threading
+import time
 import requests
+from types import MappingProxyType
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from queue import Queue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from urllib.parse import urlencode
+from flask import Flask, Response, request, render_template, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder where orjson has no wheels
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+# Logging: handlers only enqueue records, a background listener thread does the stdout I/O
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+LOG_HANDLER_NAME = 'gotravel-queue'
+
+def configure_logging(level=LOG_LEVEL):
+    """Route root logging through a queue so request threads never block on stdout
+    
+    Idempotent: re-importing the module (test reloads, gunicorn preload followed
+    by the worker import) reuses the installed handler and listener instead of
+    duplicating every log line and leaking listener threads.
+    """
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    for handler in root_logger.handlers:
+        if handler.get_name() == LOG_HANDLER_NAME:
+            return handler.listener
+    
+    log_queue = Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.set_name(LOG_HANDLER_NAME)
+    queue_handler.listener = listener
+    root_logger.addHandler(queue_handler)
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# JSON serialization helpers
+def _json_default(obj):
+    """Serialize types the JSON encoders do not handle natively"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return DefaultJSONProvider.default(obj)
+
+# Upstream API payloads are decoded eagerly with json_loads. Most of them are
+# forwarded to the client whole, so a lazy parser such as pysimdjson would end
+# up materializing nearly every key anyway.
+if orjson is not None:
+    def json_dumps(obj, sort_keys=False):
+        """Serialize an object to UTF-8 encoded JSON bytes"""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_json_default, option=option)
+
+    json_loads = orjson.loads
+else:
+    def json_dumps(obj, sort_keys=False):
+        """Serialize an object to UTF-8 encoded JSON bytes"""
+        return json.dumps(obj, default=_json_default, ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+
+    json_loads = json.loads
+
+def ojsonify(obj):
+    """Build a JSON response without going through Flask's stdlib encoder"""
+    return Response(json_dumps(obj), mimetype='application/json')
+
+def read_json_body():
+    """Parse the request body once; malformed or non-object JSON reads as an empty object"""
+    try:
+        data = json_loads(request.get_data())
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+# Response timestamps only need second precision, so format each second once.
+# No lock: the cache is a single tuple swapped in one assignment, so readers always
+# see a matching (second, string) pair; racing writers just format the same second.
+_timestamp_cache = {'value': (0, '')}  # (epoch second, ISO 8601 string)
+
+def iso_now():
+    """Return the current UTC time as an ISO 8601 string, cached per second"""
+    epoch = int(time.time())
+    cached_epoch, cached_iso = _timestamp_cache['value']
+    if epoch != cached_epoch:
+        cached_iso = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(epoch))
+        _timestamp_cache['value'] = (epoch, cached_iso)
+    return cached_iso
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that delegates to orjson
+
+    Installed as app.json so jsonify, request.get_json and the templates'
+    |tojson filter all share the fast path.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return json_loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype=self.mimetype)
+
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 CORS(app)
 
+# Shared HTTP session
+# Outbound calls stay on requests with HTTP/1.1 keep-alive rather than an
+# HTTP/2 httpx.AsyncClient: the views are synchronous, and Flask runs async
+# views on a fresh event loop per request, so an AsyncClient's connection pool
+# could not be shared between requests anyway.
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 50))  # per-host pools kept alive
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 100))  # keep-alive connections per host
+
+def create_http_session():
+    """Create a pooled keep-alive session shared by all outbound API calls"""
+    session = requests.Session()
+    retries = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+http_session = create_http_session()
+
+class SingleFlightCache:
+    """Thread-safe LRU cache with a TTL that coalesces concurrent misses
+    
+    The first caller for a missing key computes the value; callers that ask
+    for the same key while it is being computed wait for and share that result.
+    """
+    
+    def __init__(self, ttl, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._inflight = {}  # key -> Future for the computation in progress
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key, compute, cacheable=None):
+        """Return the cached value for key, computing it once if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[0]
+            
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+        
+        if not is_leader:
+            return future.result()
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            del self._inflight[key]
+            if cacheable is None or cacheable(value):
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+# Upper bound on concurrent upstream calls when enriching the destinations list
+DESTINATION_FETCH_WORKERS = 16
+
+# Enriched /api/destinations payload, refreshed at most once per TTL. Payloads
+# where some destination fell back to placeholder data are only kept briefly,
+# so an upstream blip is retried soon without every request hammering the APIs.
+DESTINATIONS_CACHE_TTL = 300  # 5 minutes
+DESTINATIONS_DEGRADED_CACHE_TTL = 30  # 30 seconds
+_destinations_cache = {'data': None, 'expires': 0.0}
+_destinations_lock = threading.Lock()
+
 # Configuration
 class Config:
     def __init__(self):
@@ -37,41 +253,42 @@ class Config:
     def setup_gemini(self):
         """Initialize Gemini AI model"""
         if not self.gemini_api_key:
-            print("❌ GEMINI_API_KEY not found in environment variables")
+            logger.error("❌ GEMINI_API_KEY not found in environment variables")
             return
         
         try:
-            genai.configure(api_key=self.gemini_api_key)
+            # REST transport goes through the (gevent-patched) socket layer; gRPC would block the worker
+            genai.configure(api_key=self.gemini_api_key, transport='rest')
             self.gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-            print("✅ Gemini 2.5 Flash model initialized successfully")
+            logger.info("✅ Gemini 2.5 Flash model initialized successfully")
         except Exception as e:
-            print(f"❌ Gemini initialization error: {e}")
+            logger.error("❌ Gemini initialization error: %s", e)
             # Fallback to gemini-pro if 2.0 flash is not available
             try:
                 self.gemini_model = genai.GenerativeModel('gemini-pro')
-                print("✅ Gemini Pro model initialized (fallback)")
+                logger.info("✅ Gemini Pro model initialized (fallback)")
             except Exception as e2:
-                print(f"❌ Gemini fallback error: {e2}")
+                logger.error("❌ Gemini fallback error: %s", e2)
                 self.gemini_model = None
     
     def validate_google_apis(self):
         """Validate Google API key works with various services"""
         if not self.google_api_key:
-            print("❌ GOOGLE_API_KEY not found in environment variables")
+            logger.error("❌ GOOGLE_API_KEY not found in environment variables")
             return
         
-        print("🔧 Validating Google API services...")
+        logger.info("🔧 Validating Google API services...")
         
         # Test Geocoding API
         try:
             test_url = f"https://maps.googleapis.com/maps/api/geocode/json?address=Paris&key={self.google_api_key}"
-            response = requests.get(test_url, timeout=5)
+            response = http_session.get(test_url, timeout=5)
             if response.status_code == 200:
-                print("✅ Google APIs accessible (tested with Geocoding)")
+                logger.info("✅ Google APIs accessible (tested with Geocoding)")
             else:
-                print(f"⚠️ Google API warning: Status {response.status_code}")
+                logger.warning("⚠️ Google API warning: Status %s", response.status_code)
         except Exception as e:
-            print(f"⚠️ Could not validate Google APIs: {e}")
+            logger.warning("⚠️ Could not validate Google APIs: %s", e)
     
     def get_api_status(self):
         """Get status of all configured APIs"""
@@ -97,8 +314,9 @@ class Config:
 class GoogleAPIService:
     """Base service class for Google APIs"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None):
         self.api_key = api_key
+        self.session = session or http_session
         self.base_url = "https://maps.googleapis.com/maps/api"
     
     def make_request(self, endpoint, params=None):
@@ -108,11 +326,11 @@ class GoogleAPIService:
                 params = {}
             params['key'] = self.api_key
             
-            response = requests.get(f"{self.base_url}/{endpoint}", params=params, timeout=10)
+            response = self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API request error: {e}")
+            return json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("API request error: %s", e)
             return {"error": str(e)}
 
 class GeocodingService(GoogleAPIService):
@@ -172,7 +390,6 @@ class TimeZoneService(GoogleAPIService):
     
     def get_timezone(self, lat, lng, timestamp=None):
         """Get timezone information for coordinates"""
-        import time
         if timestamp is None:
             timestamp = int(time.time())
         
@@ -182,11 +399,22 @@ class TimeZoneService(GoogleAPIService):
         }
         return self.make_request('timezone/json', params)
 
+# Shared read-only weather payloads returned when OpenWeatherMap is unavailable
+FALLBACK_WEATHER = MappingProxyType({
+    "weather": (MappingProxyType({"main": "Clear", "description": "clear sky"}),),
+    "main": MappingProxyType({"temp": 22, "feels_like": 25, "humidity": 60}),
+    "wind": MappingProxyType({"speed": 3.5}),
+    "name": "Location",
+    "note": "Sample data - OpenWeatherMap API unavailable"
+})
+FORECAST_UNAVAILABLE = MappingProxyType({"error": "Forecast data unavailable"})
+
 class WeatherService:
     """Weather service using OpenWeatherMap API"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None):
         self.api_key = api_key
+        self.session = session or http_session
         self.base_url = "https://api.openweathermap.org/data/2.5"
     
     def get_current_weather(self, lat, lng):
@@ -198,16 +426,34 @@ class WeatherService:
                 'appid': self.api_key,
                 'units': 'metric'
             }
-            response = requests.get(f"{self.base_url}/weather", params=params, timeout=10)
+            response = self.session.get(f"{self.base_url}/weather", params=params, timeout=10)
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             else:
-                print(f"OpenWeatherMap API error: {response.status_code}")
+                logger.warning("OpenWeatherMap API error: %s", response.status_code)
                 return self._get_fallback_weather()
         except Exception as e:
-            print(f"Weather API error: {e}")
+            logger.warning("Weather API error: %s", e)
             return self._get_fallback_weather()
     
+    def get_group_weather(self, city_ids):
+        """Get current weather for several OpenWeatherMap city IDs in one request"""
+        try:
+            params = {
+                'id': ','.join(str(city_id) for city_id in city_ids),
+                'appid': self.api_key,
+                'units': 'metric'
+            }
+            response = self.session.get(f"{self.base_url}/group", params=params, timeout=10)
+            if response.status_code == 200:
+                return json_loads(response.content)
+            else:
+                logger.warning("OpenWeatherMap group API error: %s", response.status_code)
+                return {"error": "Group weather data unavailable"}
+        except Exception as e:
+            logger.warning("Weather group API error: %s", e)
+            return {"error": "Group weather data unavailable"}
+    
     def get_forecast(self, lat, lng, days=5):
         """Get weather forecast for coordinates"""
         try:
@@ -218,56 +464,106 @@ class WeatherService:
                 'units': 'metric',
                 'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
             }
-            response = requests.get(f"{self.base_url}/forecast", params=params, timeout=10)
+            response = self.session.get(f"{self.base_url}/forecast", params=params, timeout=10)
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             else:
-                return {"error": "Forecast data unavailable"}
+                return FORECAST_UNAVAILABLE
         except Exception as e:
-            print(f"Weather forecast API error: {e}")
-            return {"error": "Forecast data unavailable"}
+            logger.warning("Weather forecast API error: %s", e)
+            return FORECAST_UNAVAILABLE
     
     def _get_fallback_weather(self):
         """Return fallback weather data when API is unavailable"""
-        return {
-            "weather": [{"main": "Clear", "description": "clear sky"}],
-            "main": {"temp": 22, "feels_like": 25, "humidity": 60},
-            "wind": {"speed": 3.5},
-            "name": "Location",
-            "note": "Sample data - OpenWeatherMap API unavailable"
-        }
+        return FALLBACK_WEATHER
+
+# Primary currency per country name, plus a lowercased view for case-insensitive lookups
+COUNTRY_CURRENCIES = {
+    "United States": "USD", "USA": "USD", "US": "USD",
+    "United Kingdom": "GBP", "UK": "GBP", "England": "GBP", "Britain": "GBP",
+    "France": "EUR", "Germany": "EUR", "Italy": "EUR", "Spain": "EUR", 
+    "Netherlands": "EUR", "Austria": "EUR", "Belgium": "EUR", "Portugal": "EUR",
+    "Japan": "JPY", "China": "CNY", "India": "INR", "Canada": "CAD",
+    "Australia": "AUD", "Switzerland": "CHF", "Sweden": "SEK", 
+    "Norway": "NOK", "Denmark": "DKK", "Thailand": "THB",
+    "South Korea": "KRW", "Singapore": "SGD", "Hong Kong": "HKD",
+    "Mexico": "MXN", "Brazil": "BRL", "Russia": "RUB", "Turkey": "TRY"
+}
+_COUNTRY_CURRENCIES_LOWER = {name.lower(): currency for name, currency in COUNTRY_CURRENCIES.items()}
+
+# Display symbols for currencies that have one
+CURRENCY_SYMBOLS = {
+    "EUR": "€", "GBP": "£", "JPY": "¥", "CNY": "¥", 
+    "INR": "₹", "CAD": "C$", "AUD": "A$", "CHF": "CHF",
+    "SEK": "kr", "NOK": "kr", "DKK": "kr", "THB": "฿"
+}
+
+@functools.lru_cache(maxsize=512)
+def lookup_country_currency(country):
+    """Resolve a country name to its primary currency (memoized; the mapping is static)"""
+    # Try exact match first
+    if country in COUNTRY_CURRENCIES:
+        return COUNTRY_CURRENCIES[country]
+    
+    # Then a case-insensitive exact match
+    country_lower = country.lower()
+    if country_lower in _COUNTRY_CURRENCIES_LOWER:
+        return _COUNTRY_CURRENCIES_LOWER[country_lower]
+    
+    # Try partial matching
+    for country_name, currency in _COUNTRY_CURRENCIES_LOWER.items():
+        if country_lower in country_name or country_name in country_lower:
+            return currency
+    
+    return "USD"  # Default fallback
+
+@functools.lru_cache(maxsize=512)
+def destination_country(destination):
+    """Extract the country part of a "City, Country" destination string"""
+    return destination.split(',')[-1].strip() if ',' in destination else destination
+
+# Known country names that are also compact enough for nearby-place searches
+CITY_STATES = frozenset({'singapore', 'hong kong'})
+
+@functools.lru_cache(maxsize=512)
+def destination_granularity(destination):
+    """Classify a destination as 'country' (a known country name) or 'city' (anything more specific)"""
+    normalized = ' '.join(destination.lower().split())
+    if normalized in _COUNTRY_CURRENCIES_LOWER and normalized not in CITY_STATES:
+        return 'country'
+    return 'city'
 
 class CurrencyService:
     """Currency conversion service using free Exchange Rates API"""
     
-    def __init__(self):
+    def __init__(self, session=None):
+        self.session = session or http_session
         self.base_url = "https://api.exchangerate-api.com/v4/latest"
-        self.cache = {}
         self.cache_duration = 3600  # 1 hour cache
-        
-    def get_exchange_rate(self, from_currency, to_currency="USD"):
-        """Get exchange rate between two currencies"""
-        cache_key = f"{from_currency}_{to_currency}"
-        current_time = datetime.now()
-        
-        # Check cache first
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if (current_time - cached_time).seconds < self.cache_duration:
-                return cached_data
-        
+        # base currency -> rates table; lookup, expiry check and refresh happen atomically
+        # under the cache's lock, and concurrent misses for one base share a single fetch
+        self.cache = SingleFlightCache(ttl=self.cache_duration, maxsize=64)
+        
+    def get_rates(self, base="USD"):
+        """Get the full exchange rate table for a base currency"""
+        # Failed lookups return {} and are not cached, so the next call retries
+        return self.cache.get_or_compute(base, lambda: self._fetch_rates(base), cacheable=bool)
+    
+    def _fetch_rates(self, base):
+        """Fetch the exchange rate table for a base currency from the API"""
         try:
-            response = requests.get(f"{self.base_url}/{from_currency}", timeout=10)
+            response = self.session.get(f"{self.base_url}/{base}", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                rate = data.get('rates', {}).get(to_currency, 1)
-                self.cache[cache_key] = (rate, current_time)
-                return rate
+                return json_loads(response.content).get('rates', {})
             else:
-                return 1  # Fallback rate
+                return {}  # Callers fall back to a 1:1 rate
         except Exception as e:
-            print(f"Currency API error: {e}")
-            return 1  # Fallback rate
+            logger.warning("Currency API error: %s", e)
+            return {}  # Callers fall back to a 1:1 rate
+    
+    def get_exchange_rate(self, from_currency, to_currency="USD"):
+        """Get exchange rate between two currencies"""
+        return self.get_rates(from_currency).get(to_currency, 1)
     
     def convert_price(self, amount, from_currency, to_currency="USD"):
         """Convert price from one currency to another"""
@@ -282,43 +578,15 @@ class CurrencyService:
         if local_currency == "USD":
             return f"${local_amount}"
         
-        usd_amount = self.convert_price(local_amount, local_currency, "USD")
-        
-        # Currency symbols mapping
-        symbols = {
-            "EUR": "€", "GBP": "£", "JPY": "¥", "CNY": "¥", 
-            "INR": "₹", "CAD": "C$", "AUD": "A$", "CHF": "CHF",
-            "SEK": "kr", "NOK": "kr", "DKK": "kr", "THB": "฿"
-        }
+        rates = self.get_rates(local_currency)
+        usd_amount = round(local_amount * rates.get("USD", 1), 2)
         
-        symbol = symbols.get(local_currency, local_currency)
+        symbol = CURRENCY_SYMBOLS.get(local_currency, local_currency)
         return f"{symbol}{local_amount} (~${usd_amount} USD)"
     
     def get_country_currency(self, country):
         """Get the primary currency for a country"""
-        currency_map = {
-            "United States": "USD", "USA": "USD", "US": "USD",
-            "United Kingdom": "GBP", "UK": "GBP", "England": "GBP", "Britain": "GBP",
-            "France": "EUR", "Germany": "EUR", "Italy": "EUR", "Spain": "EUR", 
-            "Netherlands": "EUR", "Austria": "EUR", "Belgium": "EUR", "Portugal": "EUR",
-            "Japan": "JPY", "China": "CNY", "India": "INR", "Canada": "CAD",
-            "Australia": "AUD", "Switzerland": "CHF", "Sweden": "SEK", 
-            "Norway": "NOK", "Denmark": "DKK", "Thailand": "THB",
-            "South Korea": "KRW", "Singapore": "SGD", "Hong Kong": "HKD",
-            "Mexico": "MXN", "Brazil": "BRL", "Russia": "RUB", "Turkey": "TRY"
-        }
-        
-        # Try exact match first
-        if country in currency_map:
-            return currency_map[country]
-        
-        # Try partial matching
-        country_lower = country.lower()
-        for country_name, currency in currency_map.items():
-            if country_lower in country_name.lower() or country_name.lower() in country_lower:
-                return currency
-        
-        return "USD"  # Default fallback
+        return lookup_country_currency(country)
 
 class RoadsService(GoogleAPIService):
     """Google Roads API service"""
@@ -332,26 +600,70 @@ class RoadsService(GoogleAPIService):
             'key': self.api_key
         }
         try:
-            response = requests.get(f"{base_url}/snapToRoads", params=params, timeout=10)
-            return response.json()
+            response = self.session.get(f"{base_url}/snapToRoads", params=params, timeout=10)
+            return json_loads(response.content)
         except Exception as e:
             return {"error": str(e)}
 
+# Location lookups are mostly for the same popular cities; weather is the fastest-changing part
+LOCATION_INFO_CACHE_TTL = 600  # 10 minutes
+
+# Google API statuses that describe a real answer (as opposed to quota or transient errors)
+CACHEABLE_GOOGLE_STATUSES = frozenset({'OK', 'ZERO_RESULTS'})
+
+def is_complete_location_info(info):
+    """Return True when every part of a location payload came from its upstream API
+    
+    Partial failures (an error from the timezone or places lookups, or the
+    sample fallback weather) must not be cached and shared with other callers.
+    """
+    if 'error' in info or info.get('weather') is FALLBACK_WEATHER:
+        return False
+    
+    google_parts = [info.get('timezone'), *info.get('nearby', {}).values()]
+    for part in google_parts:
+        if part is None:
+            continue
+        if 'error' in part or part.get('status', 'OK') not in CACHEABLE_GOOGLE_STATUSES:
+            return False
+    return True
+
 # Service Manager
 class GoogleServicesManager:
     """Manager for all Google API services"""
     
-    def __init__(self, google_api_key, openweathermap_api_key):
+    def __init__(self, google_api_key, openweathermap_api_key, session=None):
         self.api_key = google_api_key
-        self.geocoding = GeocodingService(google_api_key)
-        self.places = PlacesService(google_api_key)
-        self.directions = DirectionsService(google_api_key)
-        self.timezone = TimeZoneService(google_api_key)
-        self.weather = WeatherService(openweathermap_api_key)  # Use OpenWeatherMap API key
-        self.roads = RoadsService(google_api_key)
-    
-    def get_location_info(self, location_query):
-        """Get comprehensive information about a location"""
+        self.session = session or http_session
+        self.geocoding = GeocodingService(google_api_key, self.session)
+        self.places = PlacesService(google_api_key, self.session)
+        self.directions = DirectionsService(google_api_key, self.session)
+        self.timezone = TimeZoneService(google_api_key, self.session)
+        self.weather = WeatherService(openweathermap_api_key, self.session)  # Use OpenWeatherMap API key
+        self.roads = RoadsService(google_api_key, self.session)
+        self.location_cache = SingleFlightCache(ttl=LOCATION_INFO_CACHE_TTL, maxsize=256)
+    
+    def get_timezone_only(self, lat, lng):
+        """Get timezone information for coordinates that are already known"""
+        return self.timezone.get_timezone(lat, lng)
+    
+    def get_location_info(self, location_query, granularity='city'):
+        """Get comprehensive information about a location
+        
+        Country-level queries only fetch the weather: nearby places around a
+        country's centroid are not useful. Complete results are cached per
+        normalized query and granularity and shared between callers, so they
+        must be treated as read-only.
+        """
+        cache_key = (granularity, ' '.join(location_query.lower().split()))
+        return self.location_cache.get_or_compute(
+            cache_key,
+            lambda: self._fetch_location_info(location_query, granularity),
+            cacheable=is_complete_location_info
+        )
+    
+    def _fetch_location_info(self, location_query, granularity='city'):
+        """Fetch location information from the upstream APIs"""
         try:
             # Step 1: Geocode the location
             geocode_result = self.geocoding.get_coordinates(location_query)
@@ -363,24 +675,34 @@ class GoogleServicesManager:
             lng = location_data['geometry']['location']['lng']
             formatted_address = location_data['formatted_address']
             
-            # Step 2: Get additional information
-            timezone_info = self.timezone.get_timezone(lat, lng)
-            weather_info = self.weather.get_current_weather(lat, lng)
+            location = {
+                'address': formatted_address,
+                'coordinates': {'lat': lat, 'lng': lng}
+            }
             
-            # Step 3: Find nearby attractions
-            attractions = self.places.search_nearby(lat, lng, 'tourist_attraction')
-            restaurants = self.places.search_nearby(lat, lng, 'restaurant')
+            if granularity == 'country':
+                return {
+                    'location': location,
+                    'weather': self.weather.get_current_weather(lat, lng)
+                }
+            
+            # Steps 2 and 3 only depend on the coordinates, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                # Step 2: Get additional information
+                timezone_future = executor.submit(self.timezone.get_timezone, lat, lng)
+                weather_future = executor.submit(self.weather.get_current_weather, lat, lng)
+                
+                # Step 3: Find nearby attractions
+                attractions_future = executor.submit(self.places.search_nearby, lat, lng, 'tourist_attraction')
+                restaurants_future = executor.submit(self.places.search_nearby, lat, lng, 'restaurant')
             
             return {
-                'location': {
-                    'address': formatted_address,
-                    'coordinates': {'lat': lat, 'lng': lng}
-                },
-                'timezone': timezone_info,
-                'weather': weather_info,
+                'location': location,
+                'timezone': timezone_future.result(),
+                'weather': weather_future.result(),
                 'nearby': {
-                    'attractions': attractions,
-                    'restaurants': restaurants
+                    'attractions': attractions_future.result(),
+                    'restaurants': restaurants_future.result()
                 }
             }
         except Exception as e:
@@ -388,23 +710,23 @@ class GoogleServicesManager:
 
 # Initialize services
 config = Config()
-currency_service = CurrencyService()
+currency_service = CurrencyService(http_session)
 
 # Initialize Google services with proper error handling
 try:
     if config.google_api_key and config.openweathermap_api_key:
-        google_services = GoogleServicesManager(config.google_api_key, config.openweathermap_api_key)
-        print("✅ Google services initialized successfully")
+        google_services = GoogleServicesManager(config.google_api_key, config.openweathermap_api_key, http_session)
+        logger.info("✅ Google services initialized successfully")
     else:
         google_services = None
-        print("❌ Missing API keys - Google services not available")
+        logger.error("❌ Missing API keys - Google services not available")
         if not config.google_api_key:
-            print("   Missing GOOGLE_API_KEY")
+            logger.error("   Missing GOOGLE_API_KEY")
         if not config.openweathermap_api_key:
-            print("   Missing OPENWEATHERMAP_API_KEY")
+            logger.error("   Missing OPENWEATHERMAP_API_KEY")
 except Exception as e:
     google_services = None
-    print(f"❌ Failed to initialize Google services: {e}")
+    logger.error("❌ Failed to initialize Google services: %s", e)
 
 @app.route('/')
 def home():
@@ -426,65 +748,70 @@ def about():
     """Serve the about page"""
     return render_template('about.html', google_api_key=config.google_api_key)
 
-@app.route('/sitemap.xml')
-def sitemap():
-    """Generate sitemap.xml for SEO"""
-    from flask import Response
-    
-    sitemap_xml = '''<?xml version="1.0" encoding="UTF-8"?>
+SITEMAP_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
     <url>
         <loc>https://gotravel-41611891727.us-central1.run.app/</loc>
-        <lastmod>{}</lastmod>
+        <lastmod>{lastmod}</lastmod>
         <changefreq>weekly</changefreq>
         <priority>1.0</priority>
     </url>
     <url>
         <loc>https://gotravel-41611891727.us-central1.run.app/planner</loc>
-        <lastmod>{}</lastmod>
+        <lastmod>{lastmod}</lastmod>
         <changefreq>weekly</changefreq>
         <priority>0.9</priority>
     </url>
     <url>
         <loc>https://gotravel-41611891727.us-central1.run.app/explore</loc>
-        <lastmod>{}</lastmod>
+        <lastmod>{lastmod}</lastmod>
         <changefreq>monthly</changefreq>
         <priority>0.8</priority>
     </url>
     <url>
         <loc>https://gotravel-41611891727.us-central1.run.app/about</loc>
-        <lastmod>{}</lastmod>
+        <lastmod>{lastmod}</lastmod>
         <changefreq>monthly</changefreq>
         <priority>0.7</priority>
     </url>
-</urlset>'''.format(
-        datetime.now().strftime('%Y-%m-%d'),
-        datetime.now().strftime('%Y-%m-%d'),
-        datetime.now().strftime('%Y-%m-%d'),
-        datetime.now().strftime('%Y-%m-%d')
-    )
-    
-    return Response(sitemap_xml, mimetype='application/xml')
+</urlset>'''
 
-@app.route('/robots.txt')
-def robots():
-    """Generate robots.txt for SEO"""
-    from flask import Response
-    
-    robots_txt = '''User-agent: *
+ROBOTS_BODY = b'''User-agent: *
 Allow: /
 Disallow: /api/
 Disallow: /admin/
 
 Sitemap: https://gotravel-41611891727.us-central1.run.app/sitemap.xml'''
+
+SEO_CACHE_CONTROL = 'public, max-age=86400'
+
+# Rendered sitemap, rebuilt once per day so <lastmod> stays current
+_sitemap_cache = {'body': None, 'day': None}
+
+@app.route('/sitemap.xml')
+def sitemap():
+    """Generate sitemap.xml for SEO"""
+    today = datetime.now().date()
+    if _sitemap_cache['day'] != today:
+        _sitemap_cache['body'] = SITEMAP_TEMPLATE.format(lastmod=today.isoformat()).encode('utf-8')
+        _sitemap_cache['day'] = today
     
-    return Response(robots_txt, mimetype='text/plain')
+    response = Response(_sitemap_cache['body'], mimetype='application/xml')
+    response.headers['Cache-Control'] = SEO_CACHE_CONTROL
+    return response
+
+@app.route('/robots.txt')
+def robots():
+    """Generate robots.txt for SEO"""
+    response = Response(ROBOTS_BODY, mimetype='text/plain')
+    response.headers['Cache-Control'] = SEO_CACHE_CONTROL
+    return response
 
 @app.route('/api/status')
 def api_status():
     """Check the status of all configured APIs"""
     status = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_now(),
         'apis': {
             'gemini': {
                 'configured': config.gemini_api_key is not None,
@@ -517,7 +844,7 @@ def api_status():
         ]) else 'degraded'
     }
     
-    return jsonify(status)
+    return ojsonify(status)
 
 # Static file routes
 @app.route('/gotravel.png')
@@ -530,107 +857,142 @@ def favicon(filename):
     """Serve favicon files"""
     return send_from_directory('favicon', filename)
 
+# Popular destinations with coordinates and safety ratings (read-only, shared across requests)
+POPULAR_DESTINATIONS = (
+    MappingProxyType({"name": "Paris", "country": "France", "emoji": "🗼", "lat": 48.8566, "lng": 2.3522, "category": ("city", "popular", "cultural"), "safety_rating": 4.2, "safety_tips": "Be aware of pickpockets in tourist areas"}),
+    MappingProxyType({"name": "Tokyo", "country": "Japan", "emoji": "🏯", "lat": 35.6762, "lng": 139.6503, "category": ("city", "popular", "cultural"), "safety_rating": 4.8, "safety_tips": "Very safe city with excellent public safety"}),
+    MappingProxyType({"name": "New York", "country": "USA", "emoji": "🗽", "lat": 40.7128, "lng": -74.0060, "category": ("city", "popular"), "safety_rating": 4.0, "safety_tips": "Stay alert in busy areas, avoid isolated places at night"}),
+    MappingProxyType({"name": "London", "country": "UK", "emoji": "🇬🇧", "lat": 51.5074, "lng": -0.1278, "category": ("city", "popular", "cultural"), "safety_rating": 4.3, "safety_tips": "Generally safe, watch for petty theft in crowded areas"}),
+    MappingProxyType({"name": "Dubai", "country": "UAE", "emoji": "🏙️", "lat": 25.2048, "lng": 55.2708, "category": ("city", "popular"), "safety_rating": 4.6, "safety_tips": "Very safe with strict laws and good security"}),
+    MappingProxyType({"name": "Reykjavik", "country": "Iceland", "emoji": "🌋", "lat": 64.1466, "lng": -21.9426, "category": ("nature", "adventure"), "safety_rating": 4.9, "safety_tips": "Extremely safe, main concerns are weather-related"}),
+    MappingProxyType({"name": "Cape Town", "country": "South Africa", "emoji": "🦁", "lat": -33.9249, "lng": 18.4241, "category": ("nature", "adventure", "cultural"), "safety_rating": 3.5, "safety_tips": "Avoid walking alone at night, stay in safe neighborhoods"}),
+    MappingProxyType({"name": "Maldives", "country": "Maldives", "emoji": "🏖️", "lat": 3.2028, "lng": 73.2207, "category": ("beach", "popular"), "safety_rating": 4.7, "safety_tips": "Very safe resorts, follow water safety guidelines"}),
+    MappingProxyType({"name": "Bali", "country": "Indonesia", "emoji": "🌺", "lat": -8.3405, "lng": 115.0920, "category": ("beach", "cultural", "nature"), "safety_rating": 4.1, "safety_tips": "Generally safe, be cautious with street food and water"}),
+    MappingProxyType({"name": "Kyoto", "country": "Japan", "emoji": "🎌", "lat": 35.0116, "lng": 135.7681, "category": ("cultural", "nature"), "safety_rating": 4.8, "safety_tips": "Extremely safe with very low crime rates"}),
+    MappingProxyType({"name": "Petra", "country": "Jordan", "emoji": "🏜️", "lat": 30.3285, "lng": 35.4444, "category": ("cultural", "adventure"), "safety_rating": 4.0, "safety_tips": "Generally safe, follow tour guides and stay hydrated"}),
+    MappingProxyType({"name": "Barcelona", "country": "Spain", "emoji": "🏖️", "lat": 41.3851, "lng": 2.1734, "category": ("city", "beach", "cultural"), "safety_rating": 4.1, "safety_tips": "Watch for pickpockets, especially in tourist areas"}),
+)
+
+# OpenWeatherMap city IDs for popular destinations whose coordinates match a listed city.
+# Destinations without an entry (regions and sites like Bali or Petra) are looked up by coordinates.
+OWM_CITY_IDS = {
+    "Paris": 2988507, "Tokyo": 1850147, "New York": 5128581, "London": 2643743,
+    "Dubai": 292223, "Reykjavik": 3413829, "Cape Town": 3369157, "Kyoto": 1857910,
+    "Barcelona": 3128760
+}
+
+def get_batched_destination_weather():
+    """Fetch current weather for the popular destinations with city IDs in a single call"""
+    if not (google_services and google_services.weather):
+        return {}
+    
+    batch = google_services.weather.get_group_weather(OWM_CITY_IDS.values())
+    weather_by_id = {city['id']: city for city in batch.get('list', [])}
+    return {
+        name: weather_by_id[city_id]
+        for name, city_id in OWM_CITY_IDS.items()
+        if city_id in weather_by_id
+    }
+
+def enrich_destination(dest, weather_batch=None):
+    """Attach live weather and timezone data to a popular destination
+    
+    weather_batch may be a Future for the batched weather of all popular
+    destinations; it is only joined after this destination's timezone lookup,
+    so the batch request overlaps with the per-destination calls. Weather that
+    is missing from the batch is looked up by coordinates. Returns the
+    enriched record and whether both lookups returned live data.
+    """
+    try:
+        # Get timezone from Google APIs if available (coordinates are already known)
+        timezone = "UTC"
+        timezone_ok = True
+        
+        if google_services:
+            tz_data = google_services.get_timezone_only(dest['lat'], dest['lng'])
+            # Error payloads can carry the request URL (and API key), so never echo them
+            if tz_data.get('status') == 'OK' and 'timeZoneName' in tz_data:
+                timezone = tz_data['timeZoneName']
+            else:
+                timezone_ok = False
+        
+        # Get real weather data
+        weather = "Weather data unavailable"
+        weather_data = weather_batch.result().get(dest['name']) if weather_batch is not None else None
+        if weather_data is None and google_services and google_services.weather:
+            weather_data = google_services.weather.get_current_weather(dest['lat'], dest['lng'])
+        if weather_data and 'main' in weather_data:
+            temp = round(weather_data['main']['temp'])
+            desc = weather_data['weather'][0]['description'].title() if 'weather' in weather_data and weather_data['weather'] else 'Clear'
+            weather = f"{temp}°C, {desc}"
+        elif weather_data and not weather_data.get('error'):
+            # Handle fallback weather data
+            temp = weather_data.get('main', {}).get('temp', 22)
+            weather = f"{round(temp)}°C, Clear"
+        
+        complete = timezone_ok and bool(weather_data) and 'main' in weather_data and weather_data is not FALLBACK_WEATHER
+        
+        return {
+            **dest,
+            'weather': weather,
+            'timezone': timezone,
+            'safety_rating': dest.get('safety_rating', 4.0),
+            'safety_tips': dest.get('safety_tips', 'Follow standard travel safety precautions'),
+            'description': f"Explore the amazing {dest['name']} with its unique culture, attractions, and experiences."
+        }, complete
+        
+    except Exception as e:
+        # If there's an error getting data for this destination, include basic info
+        return {
+            **dest,
+            'weather': 'Data unavailable',
+            'timezone': 'UTC',
+            'safety_rating': dest.get('safety_rating', 4.0),
+            'safety_tips': dest.get('safety_tips', 'Follow standard travel safety precautions'),
+            'description': f"Discover the wonders of {dest['name']}, {dest['country']}."
+        }, False
+
 @app.route('/api/destinations', methods=['GET'])
 def get_destinations():
     """Get popular travel destinations with real-time data"""
     try:
-        # Popular destinations with coordinates and safety ratings
-        popular_destinations = [
-            {"name": "Paris", "country": "France", "emoji": "🗼", "lat": 48.8566, "lng": 2.3522, "category": ["city", "popular", "cultural"], "safety_rating": 4.2, "safety_tips": "Be aware of pickpockets in tourist areas"},
-            {"name": "Tokyo", "country": "Japan", "emoji": "🏯", "lat": 35.6762, "lng": 139.6503, "category": ["city", "popular", "cultural"], "safety_rating": 4.8, "safety_tips": "Very safe city with excellent public safety"},
-            {"name": "New York", "country": "USA", "emoji": "🗽", "lat": 40.7128, "lng": -74.0060, "category": ["city", "popular"], "safety_rating": 4.0, "safety_tips": "Stay alert in busy areas, avoid isolated places at night"},
-            {"name": "London", "country": "UK", "emoji": "🇬🇧", "lat": 51.5074, "lng": -0.1278, "category": ["city", "popular", "cultural"], "safety_rating": 4.3, "safety_tips": "Generally safe, watch for petty theft in crowded areas"},
-            {"name": "Dubai", "country": "UAE", "emoji": "🏙️", "lat": 25.2048, "lng": 55.2708, "category": ["city", "popular"], "safety_rating": 4.6, "safety_tips": "Very safe with strict laws and good security"},
-            {"name": "Reykjavik", "country": "Iceland", "emoji": "🌋", "lat": 64.1466, "lng": -21.9426, "category": ["nature", "adventure"], "safety_rating": 4.9, "safety_tips": "Extremely safe, main concerns are weather-related"},
-            {"name": "Cape Town", "country": "South Africa", "emoji": "🦁", "lat": -33.9249, "lng": 18.4241, "category": ["nature", "adventure", "cultural"], "safety_rating": 3.5, "safety_tips": "Avoid walking alone at night, stay in safe neighborhoods"},
-            {"name": "Maldives", "country": "Maldives", "emoji": "🏖️", "lat": 3.2028, "lng": 73.2207, "category": ["beach", "popular"], "safety_rating": 4.7, "safety_tips": "Very safe resorts, follow water safety guidelines"},
-            {"name": "Bali", "country": "Indonesia", "emoji": "🌺", "lat": -8.3405, "lng": 115.0920, "category": ["beach", "cultural", "nature"], "safety_rating": 4.1, "safety_tips": "Generally safe, be cautious with street food and water"},
-            {"name": "Kyoto", "country": "Japan", "emoji": "🎌", "lat": 35.0116, "lng": 135.7681, "category": ["cultural", "nature"], "safety_rating": 4.8, "safety_tips": "Extremely safe with very low crime rates"},
-            {"name": "Petra", "country": "Jordan", "emoji": "🏜️", "lat": 30.3285, "lng": 35.4444, "category": ["cultural", "adventure"], "safety_rating": 4.0, "safety_tips": "Generally safe, follow tour guides and stay hydrated"},
-            {"name": "Barcelona", "country": "Spain", "emoji": "🏖️", "lat": 41.3851, "lng": 2.1734, "category": ["city", "beach", "cultural"], "safety_rating": 4.1, "safety_tips": "Watch for pickpockets, especially in tourist areas"},
-        ]
-        
-        destinations_with_data = []
+        if _destinations_cache['data'] and time.monotonic() < _destinations_cache['expires']:
+            return ojsonify(_destinations_cache['data'])
         
-        for dest in popular_destinations:
-            try:
-                # Get real weather data
-                weather = "Weather data unavailable"
-                if google_services and google_services.weather:
-                    weather_data = google_services.weather.get_current_weather(dest['lat'], dest['lng'])
-                    if weather_data and 'main' in weather_data:
-                        temp = round(weather_data['main']['temp'])
-                        desc = weather_data['weather'][0]['description'].title() if 'weather' in weather_data and weather_data['weather'] else 'Clear'
-                        weather = f"{temp}°C, {desc}"
-                    elif weather_data and not weather_data.get('error'):
-                        # Handle fallback weather data
-                        temp = weather_data.get('main', {}).get('temp', 22)
-                        weather = f"{round(temp)}°C, Clear"
-                
-                # Get timezone and population from Google APIs if available
-                timezone = "UTC"
-                population = "Unknown"
-                
-                if google_services:
-                    # Get location details
-                    location_name = f"{dest['name']}, {dest['country']}"
-                    location_info = google_services.get_location_info(location_name)
-                    
-                    if 'timezone' in location_info:
-                        tz_data = location_info['timezone']
-                        if isinstance(tz_data, dict) and 'timeZoneName' in tz_data:
-                            timezone = tz_data['timeZoneName']
-                        else:
-                            timezone = str(tz_data)
-                    if 'population' in location_info:
-                        pop_data = location_info['population']
-                        if isinstance(pop_data, (int, float)):
-                            if pop_data >= 1000000:
-                                population = f"{pop_data/1000000:.1f}M"
-                            elif pop_data >= 1000:
-                                population = f"{pop_data/1000:.0f}K"
-                            else:
-                                population = str(int(pop_data))
-                        else:
-                            population = str(pop_data)
-                
-                destination_data = {
-                    **dest,
-                    'weather': weather,
-                    'timezone': timezone,
-                    'safety_rating': dest.get('safety_rating', 4.0),
-                    'safety_tips': dest.get('safety_tips', 'Follow standard travel safety precautions'),
-                    'description': f"Explore the amazing {dest['name']} with its unique culture, attractions, and experiences."
-                }
-                
-                destinations_with_data.append(destination_data)
-                
-            except Exception as e:
-                # If there's an error getting data for this destination, include basic info
-                destinations_with_data.append({
-                    **dest,
-                    'weather': 'Data unavailable',
-                    'timezone': 'UTC',
-                    'safety_rating': dest.get('safety_rating', 4.0),
-                    'safety_tips': dest.get('safety_tips', 'Follow standard travel safety precautions'),
-                    'description': f"Discover the wonders of {dest['name']}, {dest['country']}."
-                })
+        with _destinations_lock:
+            # Another request may have refreshed the cache while we waited for the lock
+            if _destinations_cache['data'] and time.monotonic() < _destinations_cache['expires']:
+                return ojsonify(_destinations_cache['data'])
+            
+            with ThreadPoolExecutor(max_workers=DESTINATION_FETCH_WORKERS) as executor:
+                # Submitted first so it holds a worker before any destination waits on it
+                weather_batch = executor.submit(get_batched_destination_weather)
+                enriched = list(executor.map(
+                    lambda dest: enrich_destination(dest, weather_batch),
+                    POPULAR_DESTINATIONS
+                ))
+            destinations_with_data = [record for record, _ in enriched]
+            
+            payload = {
+                'destinations': destinations_with_data,
+                'count': len(destinations_with_data),
+                'timestamp': iso_now()
+            }
+            ttl = DESTINATIONS_CACHE_TTL if all(complete for _, complete in enriched) else DESTINATIONS_DEGRADED_CACHE_TTL
+            _destinations_cache['data'] = payload
+            _destinations_cache['expires'] = time.monotonic() + ttl
         
-        return jsonify({
-            'destinations': destinations_with_data,
-            'count': len(destinations_with_data),
-            'timestamp': datetime.now().isoformat()
-        })
+        return ojsonify(payload)
     
     except Exception as e:
-        return jsonify({'error': f'Destinations API error: {str(e)}'}), 500
+        return ojsonify({'error': f'Destinations API error: {str(e)}'}), 500
 
 @app.route('/api/destination-details/<destination_name>', methods=['GET'])
 def get_destination_details(destination_name):
     """Get detailed information about a specific destination"""
     try:
         if not google_services:
-            return jsonify({'error': 'Google services not available'}), 503
+            return ojsonify({'error': 'Google services not available'}), 503
         
         # Get comprehensive location information
         location_info = google_services.get_location_info(destination_name)
@@ -644,53 +1006,53 @@ def get_destination_details(destination_name):
         else:
             attractions = {'results': []}
         
-        return jsonify({
+        return ojsonify({
             'destination': destination_name,
             'details': location_info,
             'attractions': attractions.get('results', [])[:10],  # Top 10 attractions
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         })
     
     except Exception as e:
-        return jsonify({'error': f'Destination details error: {str(e)}'}), 500
+        return ojsonify({'error': f'Destination details error: {str(e)}'}), 500
 
 @app.route('/api/location-info', methods=['POST'])
 def get_location_info():
     """Get comprehensive location information"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         location = data.get('location')
         
         if not location:
-            return jsonify({'error': 'Location is required'}), 400
+            return ojsonify({'error': 'Location is required'}), 400
         
         if not google_services:
-            return jsonify({'error': 'Google services not available'}), 503
+            return ojsonify({'error': 'Google services not available'}), 503
         
         location_info = google_services.get_location_info(location)
-        return jsonify(location_info)
+        return ojsonify(location_info)
     
     except Exception as e:
-        return jsonify({'error': f'Location info error: {str(e)}'}), 500
+        return ojsonify({'error': f'Location info error: {str(e)}'}), 500
 
 @app.route('/api/weather-forecast', methods=['POST'])
 def get_weather_forecast():
     """Get weather forecast for a location"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         location = data.get('location')
         days = data.get('days', 5)
         
         if not location:
-            return jsonify({'error': 'Location is required'}), 400
+            return ojsonify({'error': 'Location is required'}), 400
         
         if not google_services:
-            return jsonify({'error': 'Weather services not available'}), 503
+            return ojsonify({'error': 'Weather services not available'}), 503
         
         # First get coordinates
         geocode_result = google_services.geocoding.get_coordinates(location)
         if 'error' in geocode_result or 'results' not in geocode_result or not geocode_result['results']:
-            return jsonify({'error': 'Location not found'}), 404
+            return ojsonify({'error': 'Location not found'}), 404
         
         location_data = geocode_result['results'][0]
         lat = location_data['geometry']['location']['lat']
@@ -698,44 +1060,44 @@ def get_weather_forecast():
         
         # Get forecast
         forecast = google_services.weather.get_forecast(lat, lng, days)
-        return jsonify(forecast)
+        return ojsonify(forecast)
     
     except Exception as e:
-        return jsonify({'error': f'Weather forecast error: {str(e)}'}), 500
+        return ojsonify({'error': f'Weather forecast error: {str(e)}'}), 500
 
 @app.route('/api/directions', methods=['POST'])
 def get_directions():
     """Get directions between locations"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         origin = data.get('origin')
         destination = data.get('destination')
         mode = data.get('mode', 'driving')
         waypoints = data.get('waypoints')
         
         if not origin or not destination:
-            return jsonify({'error': 'Origin and destination are required'}), 400
+            return ojsonify({'error': 'Origin and destination are required'}), 400
         
         if not google_services:
-            return jsonify({'error': 'Google services not available'}), 503
+            return ojsonify({'error': 'Google services not available'}), 503
         
         directions = google_services.directions.get_directions(origin, destination, mode, waypoints)
-        return jsonify(directions)
+        return ojsonify(directions)
     
     except Exception as e:
-        return jsonify({'error': f'Directions error: {str(e)}'}), 500
+        return ojsonify({'error': f'Directions error: {str(e)}'}), 500
 
 @app.route('/api/places/search', methods=['POST'])
 def search_places():
     """Search for places"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         query = data.get('query')
         location = data.get('location')
         place_type = data.get('type')
         
         if not google_services:
-            return jsonify({'error': 'Google services not available'}), 503
+            return ojsonify({'error': 'Google services not available'}), 503
         
         if query:
             # Text search
@@ -747,51 +1109,50 @@ def search_places():
                 coords = geocode_result['results'][0]['geometry']['location']
                 results = google_services.places.search_nearby(coords['lat'], coords['lng'], place_type)
             else:
-                return jsonify({'error': 'Could not geocode location'}), 400
+                return ojsonify({'error': 'Could not geocode location'}), 400
         else:
-            return jsonify({'error': 'Query or location+type are required'}), 400
+            return ojsonify({'error': 'Query or location+type are required'}), 400
         
-        return jsonify(results)
+        return ojsonify(results)
     
     except Exception as e:
-        return jsonify({'error': f'Places search error: {str(e)}'}), 500
+        return ojsonify({'error': f'Places search error: {str(e)}'}), 500
+
+STATIC_MAP_BASE_URL = "https://maps.googleapis.com/maps/api/staticmap"
+
+@functools.lru_cache(maxsize=2048)
+def build_static_map_url(center, zoom, size, markers, api_key):
+    """Build a static map URL; deterministic in its inputs, so repeat renders hit the cache"""
+    params = [('center', center), ('zoom', zoom), ('size', size), ('key', api_key)]
+    params += [('markers', marker) for marker in markers]
+    # Leave the Static Maps marker syntax (color:red|label:A|lat,lng) readable
+    return f"{STATIC_MAP_BASE_URL}?{urlencode(params, safe=':,|')}"
 
 @app.route('/api/maps/static', methods=['POST'])
 def get_static_map():
     """Generate static map URL"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         center = data.get('center')
         zoom = data.get('zoom', 13)
         size = data.get('size', '600x400')
         markers = data.get('markers', [])
         
         if not center:
-            return jsonify({'error': 'Center location is required'}), 400
+            return ojsonify({'error': 'Center location is required'}), 400
         
         if not config.google_api_key:
-            return jsonify({'error': 'Google API key not available'}), 503
+            return ojsonify({'error': 'Google API key not available'}), 503
         
-        # Build static map URL
-        base_url = "https://maps.googleapis.com/maps/api/staticmap"
-        params = [
-            f"center={center}",
-            f"zoom={zoom}",
-            f"size={size}",
-            f"key={config.google_api_key}"
-        ]
-        
-        # Add markers
-        for marker in markers:
-            marker_param = f"markers={marker}"
-            params.append(marker_param)
-        
-        map_url = f"{base_url}?" + "&".join(params)
+        map_url = build_static_map_url(
+            str(center), str(zoom), str(size), tuple(str(marker) for marker in markers),
+            config.google_api_key
+        )
         
-        return jsonify({'map_url': map_url})
+        return ojsonify({'map_url': map_url})
     
     except Exception as e:
-        return jsonify({'error': f'Static map error: {str(e)}'}), 500
+        return ojsonify({'error': f'Static map error: {str(e)}'}), 500
 
 @app.route('/api/currency/<destination>')
 @app.route('/api/currency/<destination>/<base_currency>')
@@ -799,13 +1160,13 @@ def get_currency_info(destination, base_currency="USD"):
     """Get currency information for a destination"""
     try:
         # Extract country from destination
-        country = destination.split(',')[-1].strip() if ',' in destination else destination
+        country = destination_country(destination)
         local_currency = currency_service.get_country_currency(country)
         
         # Get exchange rate
         rate = currency_service.get_exchange_rate(base_currency, local_currency)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'destination': destination,
             'country': country,
@@ -813,255 +1174,351 @@ def get_currency_info(destination, base_currency="USD"):
             'base_currency': base_currency,
             'exchange_rate': rate,
             'formatted_rate': f"1 {base_currency} = {rate:.2f} {local_currency}",
-            'last_updated': datetime.now().isoformat()
+            'last_updated': iso_now()
         })
         
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': f'Currency lookup error: {str(e)}'
         }), 500
 
+REQUIRED_ITINERARY_FIELDS = ('destination', 'start_date', 'end_date', 'duration', 'people')
+
+def validate_itinerary_request(data):
+    """Return an error response for an itinerary request that cannot be served, else None"""
+    # Validate required fields
+    missing_fields = [field for field in REQUIRED_ITINERARY_FIELDS if not data.get(field)]
+    
+    if missing_fields:
+        return ojsonify({
+            'success': False,
+            'error': f'Missing required fields: {", ".join(missing_fields)}'
+        }), 400
+    
+    # Check if Gemini is available
+    if not config.gemini_model:
+        return ojsonify({
+            'success': False,
+            'error': 'Gemini AI is not available. Please check the API key configuration.'
+        }), 503
+    
+    return None
+
+def resolve_currency(destination):
+    """Resolve (country, local currency, USD exchange rate) for a destination in one place"""
+    country = destination_country(destination)
+    local_currency = currency_service.get_country_currency(country)
+    rate = currency_service.get_exchange_rate('USD', local_currency) if local_currency != "USD" else 1
+    return country, local_currency, rate
+
+place_name = itemgetter('name')
+
+def build_location_context(location_info):
+    """Format geocoded address, weather and nearby places as extra prompt context"""
+    if 'location' not in location_info:
+        return ""
+    
+    location_context = f"\n\nLocation Context:\n"
+    location_context += f"Address: {location_info['location']['address']}\n"
+    
+    if 'weather' in location_info and 'main' in location_info['weather']:
+        weather = location_info['weather']
+        location_context += f"Current Weather: {weather['main']['temp']}°C, {weather['weather'][0]['description']}\n"
+    
+    if 'nearby' in location_info:
+        nearby = location_info['nearby']
+        if 'attractions' in nearby and 'results' in nearby['attractions']:
+            attractions = ', '.join(map(place_name, islice(nearby['attractions']['results'], 5)))
+            location_context += f"Nearby Attractions: {attractions}\n"
+        
+        if 'restaurants' in nearby and 'results' in nearby['restaurants']:
+            restaurants = ', '.join(map(place_name, islice(nearby['restaurants']['results'], 5)))
+            location_context += f"Nearby Restaurants: {restaurants}\n"
+    
+    return location_context
+
+def fetch_location_context(destination):
+    """Look up location context for a destination, or "" when Google services can't provide it"""
+    if not google_services:
+        logger.debug("Google services not available for enhanced context")
+        return ""
+    
+    try:
+        location_info = google_services.get_location_info(destination, destination_granularity(destination))
+        return build_location_context(location_info)
+    except Exception as e:
+        logger.warning("Could not get location context: %s", e)
+        return ""
+
+def build_itinerary_prompt(data, local_currency, location_context):
+    """Build the full Gemini prompt for a validated itinerary request"""
+    # Extract data
+    destination = data.get('destination')
+    start_date = data.get('start_date')
+    end_date = data.get('end_date')
+    duration = data.get('duration')
+    people = data.get('people')
+    children = data.get('children', 0)
+    budget = data.get('budget', '')
+    lodging = data.get('lodging', '')
+    travel_transport = data.get('travelTransport', '')
+    local_transport = data.get('localTransport', '')
+    interests = data.get('interests', [])
+    special_requests = data.get('special_requests', '')
+    
+    # Create enhanced prompt with Google API integration
+    prompt = create_enhanced_itinerary_prompt(
+        destination, start_date, end_date, duration, people, children,
+        budget, lodging, travel_transport, local_transport, interests, special_requests,
+        local_currency
+    )
+    
+    logger.info("🎯 Generating enhanced itinerary for %s (%s days)", destination, duration)
+    
+    return prompt + location_context
+
+def sse_event(payload):
+    """Encode a payload as a single server-sent event"""
+    return b'data: ' + json_dumps(payload) + b'\n\n'
+
+# Identical itinerary requests share one Gemini generation while it runs, and
+# replay its result for a short while afterwards
+ITINERARY_CACHE_TTL = 60  # 1 minute
+itinerary_cache = SingleFlightCache(ttl=ITINERARY_CACHE_TTL, maxsize=128)
+
+def itinerary_request_key(data):
+    """Hash an itinerary request's inputs independently of key order"""
+    return hashlib.blake2b(json_dumps(data, sort_keys=True), digest_size=16).hexdigest()
+
+def prepare_itinerary(data):
+    """Return (prompt, local currency, USD exchange rate) for a validated itinerary request"""
+    destination = data.get('destination')
+    
+    # The exchange rate and the location context are independent upstream lookups,
+    # so fetch them concurrently and join both before calling Gemini
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        currency_future = executor.submit(resolve_currency, destination)
+        context_future = executor.submit(fetch_location_context, destination)
+        _, local_currency, rate = currency_future.result()
+        location_context = context_future.result()
+    
+    return build_itinerary_prompt(data, local_currency, location_context), local_currency, rate
+
+def create_itinerary(data):
+    """Generate, clean and currency-annotate the itinerary text for a validated request"""
+    prompt, local_currency, rate = prepare_itinerary(data)
+    
+    # Generate itinerary using Gemini
+    response = config.gemini_model.generate_content(prompt)
+    itinerary = response.text
+    
+    # Clean the itinerary text (remove unwanted markdown characters)
+    formatted_itinerary = clean_itinerary_text(itinerary)
+    
+    # Enhance with currency information
+    return enhance_itinerary_with_currency(formatted_itinerary, local_currency, rate)
+
 @app.route('/api/generate-itinerary', methods=['POST'])
 def generate_itinerary():
     """Generate travel itinerary using Gemini AI"""
     try:
         # Get request data
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['destination', 'start_date', 'end_date', 'duration', 'people']
-        missing_fields = [field for field in required_fields if not data.get(field)]
+        data = read_json_body()
         
-        if missing_fields:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required fields: {", ".join(missing_fields)}'
-            }), 400
-        
-        # Check if Gemini is available
-        if not config.gemini_model:
-            return jsonify({
-                'success': False,
-                'error': 'Gemini AI is not available. Please check the API key configuration.'
-            }), 503
-        
-        # Extract data
-        destination = data.get('destination')
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
-        duration = data.get('duration')
-        people = data.get('people')
-        children = data.get('children', 0)
-        budget = data.get('budget', '')
-        lodging = data.get('lodging', '')
-        travel_transport = data.get('travelTransport', '')
-        local_transport = data.get('localTransport', '')
-        interests = data.get('interests', [])
-        special_requests = data.get('special_requests', '')
+        error_response = validate_itinerary_request(data)
+        if error_response:
+            return error_response
         
-        # Create enhanced prompt with Google API integration
-        prompt = create_enhanced_itinerary_prompt(
-            destination, start_date, end_date, duration, people, children,
-            budget, lodging, travel_transport, local_transport, interests, special_requests
+        enhanced_itinerary = itinerary_cache.get_or_compute(
+            itinerary_request_key(data), lambda: create_itinerary(data)
         )
         
-        print(f"🎯 Generating enhanced itinerary for {destination} ({duration} days)")
-        
-        # Get location context if Google services available
-        location_context = ""
-        if google_services:
-            try:
-                location_info = google_services.get_location_info(destination)
-                if 'location' in location_info:
-                    location_context = f"\n\nLocation Context:\n"
-                    location_context += f"Address: {location_info['location']['address']}\n"
-                    
-                    if 'weather' in location_info and 'main' in location_info['weather']:
-                        weather = location_info['weather']
-                        location_context += f"Current Weather: {weather['main']['temp']}°C, {weather['weather'][0]['description']}\n"
-                    
-                    if 'nearby' in location_info:
-                        nearby = location_info['nearby']
-                        if 'attractions' in nearby and 'results' in nearby['attractions']:
-                            attractions = [place['name'] for place in nearby['attractions']['results'][:5]]
-                            location_context += f"Nearby Attractions: {', '.join(attractions)}\n"
-                        
-                        if 'restaurants' in nearby and 'results' in nearby['restaurants']:
-                            restaurants = [place['name'] for place in nearby['restaurants']['results'][:5]]
-                            location_context += f"Nearby Restaurants: {', '.join(restaurants)}\n"
-                    
-                    prompt += location_context
-            except Exception as e:
-                print(f"Could not get location context: {e}")
-        else:
-            print("Google services not available for enhanced context")
-        
-        # Generate itinerary using Gemini
-        response = config.gemini_model.generate_content(prompt)
-        itinerary = response.text
-        
-        # Clean the itinerary text (remove unwanted markdown characters)
-        formatted_itinerary = clean_itinerary_text(itinerary)
-        
-        # Enhance with currency information
-        enhanced_itinerary = enhance_itinerary_with_currency(formatted_itinerary, destination)
-        
-        return jsonify({
+        return ojsonify({
             'success': True,
             'itinerary': enhanced_itinerary,
-            'destination': destination,
-            'duration': duration,
-            'start_date': start_date,
-            'end_date': end_date,
-            'generated_at': datetime.now().isoformat()
+            'destination': data.get('destination'),
+            'duration': data.get('duration'),
+            'start_date': data.get('start_date'),
+            'end_date': data.get('end_date'),
+            'generated_at': iso_now()
         })
         
     except Exception as e:
-        print(f"❌ Error generating itinerary: {e}")
-        return jsonify({
+        logger.error("❌ Error generating itinerary: %s", e)
+        return ojsonify({
             'success': False,
             'error': f'Failed to generate itinerary: {str(e)}'
         }), 500
 
+@app.route('/api/generate-itinerary/stream', methods=['POST'])
+def stream_itinerary():
+    """Stream a generated itinerary as server-sent events while Gemini produces it"""
+    try:
+        data = read_json_body()
+        
+        error_response = validate_itinerary_request(data)
+        if error_response:
+            return error_response
+        
+        prompt, local_currency, rate = prepare_itinerary(data)
+    except Exception as e:
+        logger.error("❌ Error preparing itinerary stream: %s", e)
+        return ojsonify({
+            'success': False,
+            'error': f'Failed to generate itinerary: {str(e)}'
+        }), 500
+    
+    def generate():
+        try:
+            pending = ''
+            has_currency_info = False
+            for chunk in config.gemini_model.generate_content(prompt, stream=True):
+                pending += chunk.text
+                # Only clean finished paragraphs; the tail may still end mid-markdown
+                finished, separator, pending = pending.rpartition('\n\n')
+                if separator:
+                    cleaned = clean_itinerary_text(finished)
+                    if cleaned:
+                        has_currency_info = has_currency_info or mentions_currency_info(cleaned)
+                        yield sse_event({'text': cleaned + '\n\n'})
+            
+            cleaned = clean_itinerary_text(pending)
+            if cleaned:
+                has_currency_info = has_currency_info or mentions_currency_info(cleaned)
+                yield sse_event({'text': cleaned})
+            
+            # Same currency section /api/generate-itinerary adds; it can only be appended
+            # here because the opening lines have already been sent
+            currency_info = currency_info_section(local_currency, rate)
+            if currency_info and not has_currency_info:
+                yield sse_event({'text': currency_info, 'section': 'currency'})
+            yield sse_event({'done': True, 'generated_at': iso_now()})
+        except Exception as e:
+            logger.error("❌ Error streaming itinerary: %s", e)
+            yield sse_event({'error': f'Failed to generate itinerary: {str(e)}'})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# Markdown cleanup patterns for generated itineraries. Headers are stripped on
+# their own first (a bold span can cross lines and would otherwise hide them);
+# bold (including ***bold italic***) and stray emphasis asterisks share one pass.
+MARKDOWN_HEADER_RE = re.compile(r'^#{1,6}\s*', re.MULTILINE)
+MARKDOWN_EMPHASIS_RE = re.compile(
+    r'\*\*\*?([^*]+)\*?\*\*'    # **bold** / ***bold italic***, keep the text
+    r'|(?<!\*)\*(?!\*)'          # lone emphasis asterisks
+)
+EXCESS_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+TRAILING_WHITESPACE_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+def _strip_markup(match):
+    return match.group(1) or ''
+
 def clean_itinerary_text(text):
     """Clean itinerary text by removing unwanted markdown characters while preserving content."""
-    import re
-    
     if not text or text.strip() == '':
         return ''
     
-    # More careful cleaning to avoid removing content
-    cleaned_text = text
-    
     # Remove markdown headers (# ## ###) but keep the header text
-    cleaned_text = re.sub(r'^#{1,6}\s*', '', cleaned_text, flags=re.MULTILINE)
-    
-    # Remove bold markdown (**text**) but keep the text content
-    cleaned_text = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned_text)
+    cleaned_text = MARKDOWN_HEADER_RE.sub('', text)
     
-    # Remove remaining single asterisks used for emphasis
-    cleaned_text = re.sub(r'(?<!\*)\*(?!\*)', '', cleaned_text)
+    # Remove bold and emphasis markers but keep the text content
+    cleaned_text = MARKDOWN_EMPHASIS_RE.sub(_strip_markup, cleaned_text)
     
     # Clean up excessive whitespace while preserving paragraph breaks
-    cleaned_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned_text)
+    cleaned_text = EXCESS_BLANK_LINES_RE.sub('\n\n', cleaned_text)
     
-    # Remove leading/trailing whitespace but preserve structure
-    lines = cleaned_text.split('\n')
-    cleaned_lines = [line.rstrip() for line in lines]
-    cleaned_text = '\n'.join(cleaned_lines)
+    # Remove trailing whitespace on every line but preserve structure
+    cleaned_text = TRAILING_WHITESPACE_RE.sub('', cleaned_text)
     
     return cleaned_text.strip()
 
-def enhance_itinerary_with_currency(itinerary_text, destination):
+def currency_info_section(local_currency, rate):
+    """Return the currency information block for an itinerary, or "" for USD destinations"""
+    if local_currency == "USD":
+        return ""  # No conversion needed
+    
+    currency_info = f"\n\nCURRENCY INFORMATION:\n"
+    currency_info += f"Local Currency: {local_currency}\n"
+    currency_info += f"Exchange Rate: 1 USD = {rate:.2f} {local_currency}\n"
+    currency_info += f"Note: All prices shown as {local_currency} amount (~USD equivalent)\n"
+    return currency_info
+
+def mentions_currency_info(itinerary_text):
+    """Check whether generated text already carries its own currency section"""
+    return "CURRENCY INFORMATION" in itinerary_text or "Exchange Rate" in itinerary_text
+
+def enhance_itinerary_with_currency(itinerary_text, local_currency, rate):
     """Enhance itinerary text with currency conversion information"""
     try:
-        # Get currency for destination
-        country = destination.split(',')[-1].strip() if ',' in destination else destination
-        local_currency = currency_service.get_country_currency(country)
-        
-        if local_currency == "USD":
-            return itinerary_text  # No conversion needed
-        
         # Add currency information header if not already present
-        currency_info = f"\n\nCURRENCY INFORMATION:\n"
-        currency_info += f"Local Currency: {local_currency}\n"
-        currency_info += f"Exchange Rate: 1 USD = {currency_service.get_exchange_rate('USD', local_currency):.2f} {local_currency}\n"
-        currency_info += f"Note: All prices shown as {local_currency} amount (~USD equivalent)\n"
+        currency_info = currency_info_section(local_currency, rate)
+        if not currency_info:
+            return itinerary_text
         
         # Insert currency info after the first paragraph if not already present
-        if "CURRENCY INFORMATION" not in itinerary_text and "Exchange Rate" not in itinerary_text:
-            lines = itinerary_text.split('\n')
-            insert_index = 3 if len(lines) > 3 else len(lines)
-            lines.insert(insert_index, currency_info)
+        if not mentions_currency_info(itinerary_text):
+            # Only the first three lines need splitting off; the rest stays one string
+            lines = itinerary_text.split('\n', 3)
+            lines.insert(3, currency_info)
             itinerary_text = '\n'.join(lines)
         
         return itinerary_text
         
     except Exception as e:
-        print(f"Error enhancing currency info: {e}")
+        logger.warning("Error enhancing currency info: %s", e)
         return itinerary_text
 
-def create_enhanced_itinerary_prompt(destination, start_date, end_date, duration, people, children, budget, lodging, travel_transport, local_transport, interests, special_requests):
-    """Create an enhanced prompt with Google API integration"""
-    
-    # Get currency information for the destination
-    country = destination.split(',')[-1].strip() if ',' in destination else destination
-    local_currency = currency_service.get_country_currency(country)
-    
-    # Convert interests list to readable format
-    interests_text = ', '.join(interests) if interests else 'general sightseeing'
-    
-    # People and children context
-    people_text = f"{people} {'person' if people == 1 else 'people'}"
-    if children > 0:
-        people_text += f" (including {children} {'child' if children == 1 else 'children'})"
-    
-    group_context = ""
-    if children > 0:
-        group_context = f"\n- Plan family-friendly activities suitable for children"
-        group_context += f"\n- Consider child safety, accessibility, and age-appropriate attractions"
-    elif people == 1:
-        group_context = "\n- Plan activities suitable for solo travelers"
-    elif people == 2:
-        group_context = "\n- Plan romantic and couple-friendly activities"
-    elif people <= 4:
-        group_context = "\n- Plan activities suitable for small groups and families"
-    else:
-        group_context = "\n- Plan activities suitable for larger groups, consider group discounts and reservations"
-    
-    # Budget context
-    budget_context = ""
-    if budget:
-        if budget == 'budget':
-            budget_context = "\n- Focus on budget-friendly options, free attractions, and affordable accommodations"
-        elif budget == 'moderate':
-            budget_context = "\n- Include mid-range accommodations and dining options"
-        elif budget == 'luxury':
-            budget_context = "\n- Include luxury accommodations, fine dining, and premium experiences"
-    
-    # Lodging context
-    lodging_context = ""
-    if lodging:
-        if lodging == 'hotel':
-            lodging_context = "\n- Recommend hotels with appropriate amenities for the group size"
-        elif lodging == 'airbnb':
-            lodging_context = "\n- Suggest Airbnb or vacation rental properties suitable for the group"
-        elif lodging == 'resort':
-            lodging_context = "\n- Focus on resort accommodations with inclusive amenities"
-        elif lodging == 'hostel':
-            lodging_context = "\n- Recommend hostels with private rooms or dorms as appropriate"
-        elif lodging == 'already_booked':
-            lodging_context = "\n- Accommodation is already booked, focus on activities and dining"
-    
-    # Transportation context
-    transport_context = ""
-    if travel_transport:
-        transport_context += f"\n- Travel method: {travel_transport}"
-        if travel_transport == 'plane':
-            transport_context += " (include airport transfer recommendations)"
-        elif travel_transport == 'drive':
-            transport_context += " (include parking information and scenic route suggestions)"
-        elif travel_transport == 'train':
-            transport_context += " (include train station information and connections)"
-        elif travel_transport == 'cruise':
-            transport_context += " (include port information and shore excursions)"
-    
-    if local_transport:
-        transport_context += f"\n- Local transportation: {local_transport}"
-        if local_transport == 'rental_car':
-            transport_context += " (include rental locations, parking, and driving tips)"
-        elif local_transport == 'public_transport':
-            transport_context += " (include transit passes, routes, and schedules)"
-        elif local_transport == 'walking':
-            transport_context += " (focus on walkable attractions and neighborhoods)"
-        elif local_transport == 'rideshare':
-            transport_context += " (include ride-hailing apps and taxi information)"
-    
-    # Special requests context
-    special_context = f"\n- Special considerations: {special_requests}" if special_requests else ""
-    
-    prompt = f"""As a travel planner, create a detailed {duration}-day travel itinerary for {destination} from {start_date} to {end_date} for {people_text}.
+# Itinerary prompt building blocks: preference-specific guidance lines and the
+# static prompt skeleton, rendered once per request with format_map
+PEOPLE_NOUNS = {1: 'person'}
+CHILDREN_NOUNS = {1: 'child'}
+
+FAMILY_GROUP_CONTEXT = (
+    "\n- Plan family-friendly activities suitable for children"
+    "\n- Consider child safety, accessibility, and age-appropriate attractions"
+)
+LARGE_GROUP_CONTEXT = "\n- Plan activities suitable for larger groups, consider group discounts and reservations"
+GROUP_SIZE_CONTEXTS = {
+    1: "\n- Plan activities suitable for solo travelers",
+    2: "\n- Plan romantic and couple-friendly activities",
+    3: "\n- Plan activities suitable for small groups and families",
+    4: "\n- Plan activities suitable for small groups and families",
+}
+
+BUDGET_CONTEXTS = {
+    'budget': "\n- Focus on budget-friendly options, free attractions, and affordable accommodations",
+    'moderate': "\n- Include mid-range accommodations and dining options",
+    'luxury': "\n- Include luxury accommodations, fine dining, and premium experiences",
+}
+
+LODGING_CONTEXTS = {
+    'hotel': "\n- Recommend hotels with appropriate amenities for the group size",
+    'airbnb': "\n- Suggest Airbnb or vacation rental properties suitable for the group",
+    'resort': "\n- Focus on resort accommodations with inclusive amenities",
+    'hostel': "\n- Recommend hostels with private rooms or dorms as appropriate",
+    'already_booked': "\n- Accommodation is already booked, focus on activities and dining",
+}
+
+TRAVEL_TRANSPORT_NOTES = {
+    'plane': " (include airport transfer recommendations)",
+    'drive': " (include parking information and scenic route suggestions)",
+    'train': " (include train station information and connections)",
+    'cruise': " (include port information and shore excursions)",
+}
+
+LOCAL_TRANSPORT_NOTES = {
+    'rental_car': " (include rental locations, parking, and driving tips)",
+    'public_transport': " (include transit passes, routes, and schedules)",
+    'walking': " (focus on walkable attractions and neighborhoods)",
+    'rideshare': " (include ride-hailing apps and taxi information)",
+}
+
+ITINERARY_PROMPT_TEMPLATE = """As a travel planner, create a detailed {duration}-day travel itinerary for {destination} from {start_date} to {end_date} for {people_text}.
 
 TRAVELER PREFERENCES:
 - Group size: {people_text}
@@ -1143,31 +1600,74 @@ IMPORTANT: Always include a comprehensive "STRESS RELIEF & WELLNESS" section tha
 
 Please create a comprehensive, well-structured itinerary that maximizes the travel experience while being practical, actionable, safe, budget-conscious with accurate currency conversions, and supportive of traveler mental health and well-being."""
 
-    return prompt
+def create_enhanced_itinerary_prompt(destination, start_date, end_date, duration, people, children, budget, lodging, travel_transport, local_transport, interests, special_requests, local_currency):
+    """Create an enhanced prompt with Google API integration"""
+    
+    # Convert interests list to readable format
+    interests_text = ', '.join(interests) if interests else 'general sightseeing'
+    
+    # People and children context
+    people_text = f"{people} {PEOPLE_NOUNS.get(people, 'people')}"
+    if children > 0:
+        people_text += f" (including {children} {CHILDREN_NOUNS.get(children, 'children')})"
+        group_context = FAMILY_GROUP_CONTEXT
+    else:
+        group_context = GROUP_SIZE_CONTEXTS.get(people, LARGE_GROUP_CONTEXT)
+    
+    # Trip preference context
+    budget_context = BUDGET_CONTEXTS.get(budget, '')
+    lodging_context = LODGING_CONTEXTS.get(lodging, '')
+    
+    # Transportation context
+    transport_context = ""
+    if travel_transport:
+        transport_context += f"\n- Travel method: {travel_transport}{TRAVEL_TRANSPORT_NOTES.get(travel_transport, '')}"
+    if local_transport:
+        transport_context += f"\n- Local transportation: {local_transport}{LOCAL_TRANSPORT_NOTES.get(local_transport, '')}"
+    
+    # Special requests context
+    special_context = f"\n- Special considerations: {special_requests}" if special_requests else ""
+    
+    return ITINERARY_PROMPT_TEMPLATE.format_map({
+        'destination': destination,
+        'start_date': start_date,
+        'end_date': end_date,
+        'duration': duration,
+        'people': people,
+        'people_text': people_text,
+        'interests_text': interests_text,
+        'budget_context': budget_context,
+        'lodging_context': lodging_context,
+        'transport_context': transport_context,
+        'group_context': group_context,
+        'special_context': special_context,
+        'local_currency': local_currency,
+    })
 
 def create_itinerary_prompt(destination, start_date, end_date, duration, people, budget, interests, special_requests):
     """Create a detailed prompt for Gemini AI (legacy function)"""
     # Use default values for new parameters to maintain backward compatibility
-    return create_enhanced_itinerary_prompt(destination, start_date, end_date, duration, people, 0, budget, '', '', '', interests, special_requests)
+    local_currency = currency_service.get_country_currency(destination_country(destination))
+    return create_enhanced_itinerary_prompt(destination, start_date, end_date, duration, people, 0, budget, '', '', '', interests, special_requests, local_currency)
 
 @app.route('/api/refine-itinerary', methods=['POST'])
 def refine_itinerary():
     """Refine existing itinerary based on user feedback"""
     try:
-        data = request.get_json()
+        data = read_json_body()
         
         current_itinerary = data.get('current_itinerary')
         feedback = data.get('feedback')
         destination = data.get('destination')
         
         if not all([current_itinerary, feedback, destination]):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Missing required data for refinement'
             }), 400
         
         if not config.gemini_model:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Gemini AI is not available'
             }), 503
@@ -1186,15 +1686,15 @@ Please update the itinerary based on the user's feedback. Keep the same format a
         response = config.gemini_model.generate_content(refinement_prompt)
         refined_itinerary = response.text
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'itinerary': refined_itinerary,
-            'refined_at': datetime.now().isoformat()
+            'refined_at': iso_now()
         })
         
     except Exception as e:
-        print(f"❌ Error refining itinerary: {e}")
-        return jsonify({
+        logger.error("❌ Error refining itinerary: %s", e)
+        return ojsonify({
             'success': False,
             'error': f'Failed to refine itinerary: {str(e)}'
         }), 500
@@ -1202,7 +1702,7 @@ Please update the itinerary based on the user's feedback. Keep the same format a
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
+    return ojsonify({
         'success': False,
         'error': 'Endpoint not found'
     }), 404
@@ -1210,7 +1710,7 @@ def not_found(error):
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return jsonify({
+    return ojsonify({
         'success': False,
         'error': 'Internal server error'
     }), 500
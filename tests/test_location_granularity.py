@@ -0,0 +1,84 @@
+"""Fetch plan of GoogleServicesManager.get_location_info per destination granularity"""
+
+import json
+
+import pytest
+
+import app
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self.content = json.dumps(data).encode('utf-8')
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Records which upstream endpoint each request hits and answers with canned data"""
+
+    def __init__(self):
+        self.endpoints = []
+
+    def get(self, url, params=None, timeout=None):
+        params = params or {}
+        if 'geocode' in url:
+            self.endpoints.append('geocode')
+            return FakeResponse({'status': 'OK', 'results': [{
+                'geometry': {'location': {'lat': 48.85, 'lng': 2.35}},
+                'formatted_address': params.get('address', ''),
+            }]})
+        if 'timezone' in url:
+            self.endpoints.append('timezone')
+            return FakeResponse({'status': 'OK', 'timeZoneName': 'Central European Time'})
+        if 'nearbysearch' in url:
+            self.endpoints.append(f"nearby:{params['type']}")
+            return FakeResponse({'status': 'OK', 'results': [{'name': 'Somewhere'}]})
+        if url.endswith('/weather'):
+            self.endpoints.append('weather')
+            return FakeResponse({'main': {'temp': 20}, 'weather': [{'description': 'clear sky'}]})
+        raise AssertionError(f"unexpected request to {url}")
+
+
+CITY_FETCH_PLAN = ['geocode', 'nearby:restaurant', 'nearby:tourist_attraction', 'timezone', 'weather']
+
+
+@pytest.mark.parametrize('destination, granularity', [
+    ('France', 'country'),
+    ('  japan ', 'country'),
+    ('Paris, France', 'city'),
+    ('Tokyo', 'city'),
+    ('Singapore', 'city'),
+    ('1 Rue de Rivoli, Paris, France', 'city'),
+])
+def test_destination_granularity(destination, granularity):
+    assert app.destination_granularity(destination) == granularity
+
+
+@pytest.mark.parametrize('destination, fetch_plan', [
+    ('France', ['geocode', 'weather']),
+    ('Paris, France', CITY_FETCH_PLAN),
+    ('1 Rue de Rivoli, Paris, France', CITY_FETCH_PLAN),
+])
+def test_fetch_plan_per_granularity(destination, fetch_plan):
+    session = FakeSession()
+    services = app.GoogleServicesManager('google-key', 'owm-key', session)
+
+    info = services.get_location_info(destination, app.destination_granularity(destination))
+
+    assert sorted(session.endpoints) == fetch_plan
+    assert ('nearby' in info) == (fetch_plan == CITY_FETCH_PLAN)
+
+
+def test_complete_results_are_cached_per_granularity():
+    session = FakeSession()
+    services = app.GoogleServicesManager('google-key', 'owm-key', session)
+
+    services.get_location_info('Paris, France', 'city')
+    services.get_location_info(' paris,  FRANCE ', 'city')
+    assert session.endpoints.count('geocode') == 1
+
+    services.get_location_info('Paris, France', 'country')
+    assert session.endpoints.count('geocode') == 2